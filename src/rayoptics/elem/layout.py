@@ -19,8 +19,10 @@
 
 import numpy as np
 
-from rayoptics.gui.util import (GUIHandle, transform_ray_seg, bbox_from_poly,
-                                transform_poly, inv_transform_poly)
+from rayoptics.gui.util import (GUIHandle, bbox_from_poly,
+                                transform_poly, inv_transform_poly,
+                                tfrm_affine,
+                                transform_ray, transform_ray_bundle)
 
 from rayoptics.raytr.analyses import RayFan
 from rayoptics.raytr.trace import (trace_boundary_rays_at_field,
@@ -57,6 +59,25 @@ lo_lw = {
     'edge': 0.5,
     }
 
+# 2D affine of the tfrms used for rendering, keyed by id(tfrm)
+_tfrm_affine_cache = {}
+
+
+def get_affine(tfrm):
+    """ returns tfrm_affine(tfrm), reusing the result for the same tfrm """
+    try:
+        return _tfrm_affine_cache[id(tfrm)][1]
+    except KeyError:
+        affine = tfrm_affine(tfrm)
+        # keep a reference to tfrm so its id isn't reused while cached
+        _tfrm_affine_cache[id(tfrm)] = tfrm, affine
+        return affine
+
+
+def clear_affine_cache():
+    """ discard cached affines, e.g. when the transforms are recomputed """
+    _tfrm_affine_cache.clear()
+
 
 def create_optical_element(opt_model, e):
     # if isinstance(e, ele.CementedElement):
@@ -87,9 +108,12 @@ class OpticalElement():
         return o_str
 
     def update_shape(self, view):
+        # the wrapper is reused across rebuilds; only keep current handles
+        self.handles = {}
         self.e.render_handles(self.opt_model)
         for key, graphics_handle in self.e.handles.items():
             poly_data = graphics_handle.polydata 
+            affine = get_affine(graphics_handle.tfrm)
             # print(self.listobj_str()
             #       +f"{type(poly_data).__name__}, # polys={len(poly_data)}, {key} {graphics_handle.polytype}")
             if isinstance(poly_data, tuple):
@@ -97,13 +121,15 @@ class OpticalElement():
                 for poly_list in poly_data:
                     for poly_seg in poly_list:
                         poly = np.array(poly_seg)
-                        poly_gbl = transform_poly(graphics_handle.tfrm, poly)
+                        poly_gbl = transform_poly(graphics_handle.tfrm, poly,
+                                                  affine=affine)
                         bbox = bbox_from_poly(poly_gbl)
                         polys.append(np.array(poly_gbl))
                 poly_gbl = tuple(polys)
             else:
                 poly = np.array(poly_data)
-                poly_gbl = transform_poly(graphics_handle.tfrm, poly)
+                poly_gbl = transform_poly(graphics_handle.tfrm, poly,
+                                          affine=affine)
                 bbox = bbox_from_poly(poly_gbl)
 
             if graphics_handle.polytype == 'polygon':
@@ -147,86 +173,93 @@ class OpticalElement():
         return self.e.label
 
     def edit_shape_actions(self):
-        def add_event_data(self, event, handle):
-            gbl_pt = np.array([event.xdata, event.ydata])
-            lcl_pt = inv_transform_poly(self.e.handles[handle].tfrm, gbl_pt)
-            event.lcl_pt = lcl_pt
-            if self.select_pt is not None:
-                xdata, ydata = self.select_pt[1]
-            else:
-                xdata, ydata = 0., 0.
-            dxdy = event.xdata - xdata, event.ydata - ydata
-            event.dxdy = dxdy
-
-        def on_select_shape(fig, handle, event, info):
-            handle_actions = self.handle_actions[handle]
-            add_event_data(self, event, handle)
-            for key, action_obj in handle_actions.items():
-                action_obj.actions['press'](fig, event)
-            self.select_pt = ((event.x, event.y), (event.xdata, event.ydata))
-#            print('select pt:', self.select_pt)
-#            print('select pt:', event.x, event.y)
-
-        def on_edit_shape(fig, handle, event, info):
-            handle_actions = self.handle_actions[handle]
-            x, y = self.select_pt[0]
-            xdata, ydata = self.select_pt[1]
-            delta_x, delta_y = abs(x - event.x), abs(y - event.y)
-            delta_xdata, delta_ydata = (abs(xdata - event.xdata),
-                                        abs(ydata - event.ydata))
-            if self.move_direction is None:
-                if delta_x > delta_y:
-                    self.move_direction = 'x'
-#                    print('move horizontal: delta x, y:', delta_x, delta_y,
-#                          delta_xdata, delta_ydata)
-                elif delta_x < delta_y:
-                    self.move_direction = 'y'
-#                    print('move vertical: delta x, y:', delta_x, delta_y,
-#                          delta_xdata, delta_ydata)
-                else:
-                    self.move_direction = None
-#                    print('move same: delta x, y:', delta_x, delta_y)
-
-            add_event_data(self, event, handle)
-#            print('move pt:', event.xdata, event.ydata, event.lcl_pt)
-            if 'pt' in handle_actions:
-                if 'drag' in handle_actions['pt'].actions:
-                    handle_actions['pt'].actions['drag'](fig, event,
-                                                         event.lcl_pt)
-            elif self.move_direction in handle_actions:
-                if 'drag' in handle_actions[self.move_direction].actions:
-                    if self.move_direction == 'x':
-                        handle_actions['x'].actions['drag'](fig, event,
-                                                            event.dxdy[0])
-                    elif self.move_direction == 'y':
-                        handle_actions['y'].actions['drag'](fig, event,
-                                                            event.dxdy[1])
-
-            fig.refresh_gui(build='update')
-
-        def on_release_shape(fig, handle, event, info):
-            # print('release pt:', event.x, event.y)
-            handle_actions = self.handle_actions[handle]
-            add_event_data(self, event, handle)
-            for key, action_obj in handle_actions.items():
-                action_obj.actions['release'](fig, event)
-            self.select_pt = None
-            self.move_direction = None
-            fig.refresh_gui(build='update')
-
         actions = {}
-        actions['press'] = on_select_shape
-        actions['drag'] = on_edit_shape
-        actions['release'] = on_release_shape
+        actions['press'] = self.on_select_shape
+        actions['drag'] = self.on_edit_shape
+        actions['release'] = self.on_release_shape
         return actions
 
+    def add_event_data(self, event, handle):
+        gbl_pt = np.array([event.xdata, event.ydata])
+        tfrm = self.e.handles[handle].tfrm
+        lcl_pt = inv_transform_poly(tfrm, gbl_pt, affine=get_affine(tfrm))
+        event.lcl_pt = lcl_pt
+        if self.select_pt is not None:
+            xdata, ydata = self.select_pt[1]
+        else:
+            xdata, ydata = 0., 0.
+        dxdy = event.xdata - xdata, event.ydata - ydata
+        event.dxdy = dxdy
+
+    def on_select_shape(self, fig, handle, event, info):
+        handle_actions = self.handle_actions[handle]
+        self.add_event_data(event, handle)
+        for key, action_obj in handle_actions.items():
+            action_obj.actions['press'](fig, event)
+        self.select_pt = ((event.x, event.y), (event.xdata, event.ydata))
+#        print('select pt:', self.select_pt)
+#        print('select pt:', event.x, event.y)
+
+    def on_edit_shape(self, fig, handle, event, info):
+        handle_actions = self.handle_actions[handle]
+        x, y = self.select_pt[0]
+        xdata, ydata = self.select_pt[1]
+        delta_x, delta_y = abs(x - event.x), abs(y - event.y)
+        delta_xdata, delta_ydata = (abs(xdata - event.xdata),
+                                    abs(ydata - event.ydata))
+        if self.move_direction is None:
+            if delta_x > delta_y:
+                self.move_direction = 'x'
+#            print('move horizontal: delta x, y:', delta_x, delta_y,
+#                  delta_xdata, delta_ydata)
+            elif delta_x < delta_y:
+                self.move_direction = 'y'
+#            print('move vertical: delta x, y:', delta_x, delta_y,
+#                  delta_xdata, delta_ydata)
+            else:
+                self.move_direction = None
+#            print('move same: delta x, y:', delta_x, delta_y)
+
+        self.add_event_data(event, handle)
+#        print('move pt:', event.xdata, event.ydata, event.lcl_pt)
+        if 'pt' in handle_actions:
+            if 'drag' in handle_actions['pt'].actions:
+                handle_actions['pt'].actions['drag'](fig, event,
+                                                     event.lcl_pt)
+        elif self.move_direction in handle_actions:
+            if 'drag' in handle_actions[self.move_direction].actions:
+                if self.move_direction == 'x':
+                    handle_actions['x'].actions['drag'](fig, event,
+                                                        event.dxdy[0])
+                elif self.move_direction == 'y':
+                    handle_actions['y'].actions['drag'](fig, event,
+                                                        event.dxdy[1])
+
+        fig.refresh_gui(build='update')
+
+    def on_release_shape(self, fig, handle, event, info):
+        # print('release pt:', event.x, event.y)
+        handle_actions = self.handle_actions[handle]
+        self.add_event_data(event, handle)
+        for key, action_obj in handle_actions.items():
+            action_obj.actions['release'](fig, event)
+        self.select_pt = None
+        self.move_direction = None
+        fig.refresh_gui(build='update')
+
 
 class RayBundle():
-    """ class for ray bundle from a single field point """
+    """ class for ray bundle from a single field point
+
+    The wavelength and seq_model are resolved by the caller and fixed for
+    the life of the bundle; a wavelength change needs a rebuild.
+    """
 
     def __init__(self, opt_model, fld, fld_label, wvl, start_offset,
-                 ray_table_callback=None, **kwargs):
+                 ray_table_callback=None, seq_model=None, **kwargs):
         self.opt_model = opt_model
+        self.seq_model = (opt_model['seq_model'] if seq_model is None
+                          else seq_model)
         self.fld = fld
         self.fld_label = fld_label
         self.wvl = wvl
@@ -244,50 +277,44 @@ class RayBundle():
     def get_label(self):
         return self.fld_label
 
-    def render_ray(self, ray, tfrms):
-        poly = []
-        for i, r in enumerate(ray):
-            transform_ray_seg(poly, r, tfrms[i])
-        return np.array(poly)
-
-    def render_shape(self, rayset, tfrms):
-        poly1 = []
-        for i, r in enumerate(rayset['+Y'].ray):
-            transform_ray_seg(poly1, r, tfrms[i])
+    def render_ray(self, ray, tfrms, stacked_tfrms=None):
+        return transform_ray(ray, tfrms, stacked_tfrms=stacked_tfrms)
 
-        poly2 = []
-        for i, r in enumerate(rayset['-Y'].ray):
-            transform_ray_seg(poly2, r, tfrms[i])
-
-        poly2.reverse()
-        poly1.extend(poly2)
-        bbox = bbox_from_poly(poly1)
-        return poly1, bbox
+    def render_shape(self, rayset, tfrms, stacked_tfrms=None):
+        poly1 = self.render_ray(rayset['+Y'].ray, tfrms,
+                                stacked_tfrms=stacked_tfrms)
+        poly2 = self.render_ray(rayset['-Y'].ray, tfrms,
+                                stacked_tfrms=stacked_tfrms)
+        poly = np.concatenate((poly1, poly2[::-1]), axis=0)
+        bbox = bbox_from_poly(poly)
+        return poly, bbox
 
     def update_shape(self, view):
-        wvl = self.opt_model['optical_spec']['wvls'].central_wvl
-        self.wvl = wvl
         rayset = trace_boundary_rays_at_field(self.opt_model,
-                                              self.fld, wvl,
+                                              self.fld, self.wvl,
                                               use_named_tuples=True,
                                               rayerr_filter='full',
                                               check_apertures=view.clip_rays)
 
         self.rayset = boundary_ray_dict(self.opt_model, rayset)
 
-        seq_model = self.opt_model.seq_model
-        tfrms = seq_model.gbl_tfrms        #     shift_start_of_ray_bundle(start_bundle, ray_list, rot, t)
+        tfrms = self.seq_model.gbl_tfrms
+        stacked_tfrms = view.stacked_tfrms
 
         if view.do_draw_beams:
-            poly, bbox = self.render_shape(self.rayset, tfrms)
+            poly, bbox = self.render_shape(self.rayset, tfrms,
+                                           stacked_tfrms=stacked_tfrms)
 
             p = view.create_polygon(poly, fill_color=lo_rgb['rayfan_fill'])
             self.handles['shape'] = GUIHandle(p, bbox)
 
         if view.do_draw_edge_rays:
-            cr = self.render_ray(self.rayset['00'].ray, tfrms)
-            upr = self.render_ray(self.rayset['+Y'].ray, tfrms)
-            lwr = self.render_ray(self.rayset['-Y'].ray, tfrms)
+            cr = self.render_ray(self.rayset['00'].ray, tfrms,
+                                 stacked_tfrms=stacked_tfrms)
+            upr = self.render_ray(self.rayset['+Y'].ray, tfrms,
+                                  stacked_tfrms=stacked_tfrms)
+            lwr = self.render_ray(self.rayset['-Y'].ray, tfrms,
+                                  stacked_tfrms=stacked_tfrms)
             kwargs = {
                 'linewidth': lo_lw['line'],
                 'color': lo_rgb['ray'],
@@ -306,16 +333,16 @@ class RayBundle():
         return self.handles
 
     def edit_ray_bundle_actions(self):
-        def on_select_ray(fig, handle, event, info):
-            if handle != 'shape':
-                ray_table = self.ray_table_callback()
-                ray_table.root = self.rayset[handle].ray
-                fig.refresh_gui(build='update')
-
         actions = {}
-        actions['press'] = on_select_ray
+        actions['press'] = self.on_select_ray
         return actions
 
+    def on_select_ray(self, fig, handle, event, info):
+        if handle != 'shape':
+            ray_table = self.ray_table_callback()
+            ray_table.root = self.rayset[handle].ray
+            fig.refresh_gui(build='update')
+
 
 class RayFanBundle():
     """ class for a RayFan from a single field point """
@@ -340,12 +367,9 @@ class RayFanBundle():
     def get_label(self):
         return self.label
 
-    def render_ray(self, ray_pkg, tfrms):
-        poly = []
+    def render_ray(self, ray_pkg, tfrms, stacked_tfrms=None):
         ray, op_delta, wvl = ray_pkg
-        for i, r in enumerate(ray):
-            transform_ray_seg(poly, r, tfrms[i])
-        return np.array(poly)
+        return transform_ray(ray, tfrms, stacked_tfrms=stacked_tfrms)
 
     def update_shape(self, view):
         ray_fan = self.ray_fan
@@ -357,8 +381,8 @@ class RayFanBundle():
 
         ray_list = []
         for ray_item in fan:
-            ray_pkg = ray_item[2]
-            ray_list.append(ray_pkg)
+            ray, op_delta, wvl = ray_item[2]
+            ray_list.append(ray)
 
         ray_color = lo_rgb['ray'] if ray_fan.color is None else ray_fan.color
         kwargs = {
@@ -368,8 +392,9 @@ class RayFanBundle():
             'hilite': lo_rgb['ray'],
             }
 
-        for i, ray_pkg in enumerate(ray_list):
-            global_ray = self.render_ray(ray_pkg, tfrms)
+        global_rays = transform_ray_bundle(ray_list, tfrms,
+                                           stacked_tfrms=view.stacked_tfrms)
+        for i, global_ray in enumerate(global_rays):
             ray_poly = view.create_polyline(global_ray, **kwargs)
             self.handles[i] = GUIHandle(ray_poly, bbox_from_poly(global_ray))
 
@@ -399,12 +424,9 @@ class SingleRay():
     def get_label(self):
         return self.label
 
-    def render_ray(self, ray_pkg, tfrms):
-        poly = []
+    def render_ray(self, ray_pkg, tfrms, stacked_tfrms=None):
         ray, op_delta, wvl = ray_pkg
-        for i, r in enumerate(ray):
-            transform_ray_seg(poly, r, tfrms[i])
-        return np.array(poly)
+        return transform_ray(ray, tfrms, stacked_tfrms=stacked_tfrms)
 
     def update_shape(self, view):
         ray = self.ray
@@ -412,7 +434,8 @@ class SingleRay():
 
         seq_model = self.opt_model['seq_model']
         tfrms = seq_model.gbl_tfrms
-        global_ray = self.render_ray(ray.ray_pkg, tfrms)
+        global_ray = self.render_ray(ray.ray_pkg, tfrms,
+                                     stacked_tfrms=view.stacked_tfrms)
 
         ray_color = lo_rgb['ray'] if ray.color is None else ray.color
         kwargs = {
@@ -527,6 +550,8 @@ class LensLayout():
         from rayoptics.elem import parttree
         self.opt_model = opt_model
         self.ray_table = None
+        # OpticalElement wrappers, keyed by their part tree element
+        self.element_cache = {}
 
         light_or_dark(is_dark=is_dark)
 
@@ -580,22 +605,40 @@ class LensLayout():
 
     def create_element_entities(self, view, part_filter=''):
         e_nodes = self.renderable_pt_nodes(part_filter=part_filter)
-        elements = [create_optical_element(self.opt_model, e_node.id)
-                    for e_node in e_nodes]
+        elements = [self.create_oe(e_node.id) for e_node in e_nodes]
+        self.drop_stale_oes({e_node.id for e_node in e_nodes})
         return elements
 
     def create_oe(self, e):
-        """ opaque wrapper for create_optical_element() """
-        return create_optical_element(self.opt_model, e)
+        """ opaque wrapper for create_optical_element()
+
+        The wrapper for **e** is reused if one exists, so that its editing
+        state persists; its handle actions are refreshed from **e**.
+        """
+        oe = self.element_cache.get(e)
+        if oe is None:
+            oe = create_optical_element(self.opt_model, e)
+            self.element_cache[e] = oe
+        else:
+            oe.handle_actions = e.handle_actions()
+        return oe
+
+    def drop_stale_oes(self, e_set):
+        """ remove cached wrappers for elements that aren't in **e_set** """
+        for e in list(self.element_cache):
+            if e not in e_set:
+                del self.element_cache[e]
 
     def create_ray_entities(self, view, start_offset, **kwargs):
         ray_bundles = []
         fov = self.opt_model['optical_spec']['fov']
-        wvl = self.opt_model['seq_model'].central_wavelength()
+        seq_model = self.opt_model['seq_model']
+        wvl = seq_model.central_wavelength()
         for i, fld in enumerate(fov.fields):
             fld_label = fov.index_labels[i]
             rb = RayBundle(self.opt_model, fld, fld_label, wvl, start_offset,
-                           ray_table_callback=self.get_ray_table, **kwargs)
+                           ray_table_callback=self.get_ray_table,
+                           seq_model=seq_model, **kwargs)
             ray_bundles.append(rb)
         return ray_bundles
 
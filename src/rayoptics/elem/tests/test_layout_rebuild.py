@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test that reused layout element wrappers track their element's handles"""
+
+
+import unittest
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import rayoptics as ro
+from rayoptics.gui.appcmds import open_model
+from rayoptics.elem.elements import CementedElement
+from rayoptics.mpl.interactivelayout import InteractiveLayout
+
+
+class LayoutRebuildTestCase(unittest.TestCase):
+    def setUp(self):
+        root_pth = Path(ro.__file__).resolve().parent
+        self.opm = open_model(root_pth/'codev/tests/ag_dblgauss.seq')
+        self.fig = plt.figure(FigureClass=InteractiveLayout,
+                              opt_model=self.opm, is_dark=False)
+        self.fig.plot()
+
+    def tearDown(self):
+        plt.close(self.fig)
+
+    def test_rebuild_after_handles_change(self):
+        ce = next(e for e in self.opm['ele_model'].elements
+                  if isinstance(e, CementedElement))
+        oe = self.fig.layout.element_cache[ce]
+        self.assertGreater(len(oe.handles), 1)
+
+        ce.do_render_shape = False
+        self.fig.refresh()
+
+        self.assertIs(self.fig.layout.element_cache[ce], oe)
+        self.assertEqual(set(oe.handles), set(ce.handles))
+        drawn = [a for a in self.fig.artists if a.shape[0] is oe]
+        self.assertEqual(len(drawn), len(ce.handles))
+
+        ce.do_render_shape = True
+        self.fig.refresh()
+        self.assertEqual(set(oe.handles), set(ce.handles))
+        self.assertGreater(len(oe.handles), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
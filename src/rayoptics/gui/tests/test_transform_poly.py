@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test the folded affine of transform_poly and inv_transform_poly"""
+
+
+import unittest
+import numpy as np
+import numpy.testing as npt
+
+from rayoptics.gui.util import tfrm_affine, transform_poly, inv_transform_poly
+
+
+def orig_transform_poly(tfrm, poly):
+    """ the four matmul form of transform_poly, for Nx2 **poly** """
+    coord_flip = np.array([[0., 1.], [1., 0.]])
+    poly = np.matmul(coord_flip, poly.T)
+    poly = np.matmul(tfrm[0][1:, 1:], poly).T
+    poly += np.array([tfrm[1][1], tfrm[1][2]])
+    return np.matmul(poly, coord_flip)
+
+
+def orig_inv_transform_pt(tfrm, pt):
+    """ the four matmul form of inv_transform_poly, for a 1-D point **pt** """
+    coord_flip = np.array([[0., 1.], [1., 0.]])
+    pt = np.matmul(coord_flip, pt.T)
+    pt -= np.array([tfrm[1][1], tfrm[1][2]])
+    pt = np.matmul(tfrm[0][1:, 1:], pt).T
+    return np.matmul(pt, coord_flip)
+
+
+def x_rotation(alpha):
+    c, s = np.cos(alpha), np.sin(alpha)
+    return np.array([[1., 0., 0.], [0., c, -s], [0., s, c]])
+
+
+class TransformPolyTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.tfrms = [(x_rotation(a), rng.normal(size=3)*10.)
+                      for a in rng.uniform(-np.pi, np.pi, size=25)]
+        # the identities hold for any matrix, not only rotations
+        self.tfrms += [(rng.normal(size=(3, 3)), rng.normal(size=3))
+                       for _ in range(25)]
+        self.poly = rng.normal(size=(7, 2))*5.
+        self.pt = rng.normal(size=2)*5.
+
+    def test_transform_poly(self):
+        for tfrm in self.tfrms:
+            expected = orig_transform_poly(tfrm, self.poly.copy())
+            npt.assert_allclose(transform_poly(tfrm, self.poly), expected)
+            npt.assert_allclose(transform_poly(tfrm, self.poly,
+                                               affine=tfrm_affine(tfrm)),
+                                expected)
+
+    def test_transform_pt(self):
+        for tfrm in self.tfrms:
+            expected = orig_transform_poly(tfrm, self.pt[np.newaxis, :])[0]
+            npt.assert_allclose(transform_poly(tfrm, self.pt), expected)
+
+    def test_inv_transform_pt(self):
+        """ the 1-D point case, as used by OpticalElement.add_event_data """
+        for tfrm in self.tfrms:
+            expected = orig_inv_transform_pt(tfrm, self.pt.copy())
+            lcl_pt = inv_transform_poly(tfrm, self.pt)
+            self.assertEqual(lcl_pt.shape, (2,))
+            npt.assert_allclose(lcl_pt, expected)
+            npt.assert_allclose(inv_transform_poly(tfrm, self.pt,
+                                                   affine=tfrm_affine(tfrm)),
+                                expected)
+
+    def test_inv_transform_poly(self):
+        for tfrm in self.tfrms:
+            expected = [orig_inv_transform_pt(tfrm, pt.copy())
+                        for pt in self.poly]
+            npt.assert_allclose(inv_transform_poly(tfrm, self.poly),
+                                expected)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
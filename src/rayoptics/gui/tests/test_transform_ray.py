@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test the stacked ray transforms against per segment transform_ray_seg"""
+
+
+import unittest
+from collections import namedtuple
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+
+from rayoptics.gui import util
+from rayoptics.gui.util import (transform_ray_seg, stack_tfrms,
+                                transform_ray, transform_ray_bundle)
+
+Seg = namedtuple('Seg', ['p'])
+
+
+def seg_transform_ray(ray, tfrms):
+    """ the one segment at a time form of transform_ray """
+    poly = []
+    for i, r in enumerate(ray):
+        transform_ray_seg(poly, r, tfrms[i])
+    return np.array(poly).reshape(-1, 2)
+
+
+class TransformRayTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        num_ifcs = 8
+        self.tfrms = [(rng.normal(size=(3, 3)), rng.normal(size=3)*10.)
+                      for _ in range(num_ifcs)]
+        # full length rays, rays shorter than tfrms and an empty ray
+        self.rays = [[Seg(rng.normal(size=3)*5.) for _ in range(n)]
+                     for n in (num_ifcs, num_ifcs, 3, 1, 0)]
+
+    def check_transforms(self):
+        for stacked_tfrms in (None, stack_tfrms(self.tfrms)):
+            expected = [seg_transform_ray(ray, self.tfrms)
+                        for ray in self.rays]
+            for ray, exp in zip(self.rays, expected):
+                npt.assert_allclose(
+                    transform_ray(ray, self.tfrms,
+                                  stacked_tfrms=stacked_tfrms), exp)
+            bundle = transform_ray_bundle(self.rays, self.tfrms,
+                                          stacked_tfrms=stacked_tfrms)
+            self.assertEqual(len(bundle), len(self.rays))
+            for pts, exp in zip(bundle, expected):
+                npt.assert_allclose(pts, exp)
+
+    def test_plot_pts(self):
+        """ the numba kernel, when numba is available """
+        self.check_transforms()
+
+    def test_plot_pts_np(self):
+        with mock.patch.object(util, '_plot_pts', util._plot_pts_np):
+            self.check_transforms()
+
+    def test_empty_bundle(self):
+        bundle = transform_ray_bundle([[], []], self.tfrms)
+        self.assertEqual([pts.shape for pts in bundle], [(0, 2), (0, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -12,6 +12,15 @@ import numpy as np
 
 import opticalglass.glasspolygons as gp  # type: ignore
 
+try:
+    from numba import njit  # type: ignore
+except ImportError:
+    njit = None
+
+# swaps (y, z) and (z, y) coordinates; shared, so it's made read-only
+_COORD_FLIP = np.array([[0., 1.], [1., 0.]])
+_COORD_FLIP.setflags(write=False)
+
 GUIHandle = namedtuple('GUIHandle', ['poly', 'bbox'])
 GUIHandle.poly.__doc__ = "poly entity for underlying graphics system (e.g. mpl)"
 GUIHandle.bbox.__doc__ = "bounding box for poly"
@@ -26,20 +35,106 @@ GUIHandle.bbox.__doc__ = "bounding box for poly"
 
 
 def transform_ray_seg(poly, r, tfrm):
+    """ append ray segment r in plot coordinates to poly
+
+    The one segment form of transform_ray, kept as its reference in tests.
+    """
     rot, trns = tfrm
     p = rot.dot(r.p) + trns
     poly.append([p[2], p[1]])
 
 
+def _plot_pts_np(pts, rots, trns):
+    """ apply rots[i], trns[i] to pts[i], returning (z, y) plot coords """
+    gbl_pts = np.einsum('nij,nj->ni', rots, pts) + trns
+    return gbl_pts[:, [2, 1]]
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _plot_pts(pts, rots, trns):
+        """ apply rots[i], trns[i] to pts[i], returning (z, y) plot coords """
+        n = pts.shape[0]
+        plot_pts = np.empty((n, 2))
+        for i in range(n):
+            x, y, z = pts[i, 0], pts[i, 1], pts[i, 2]
+            plot_pts[i, 0] = (rots[i, 2, 0]*x + rots[i, 2, 1]*y +
+                              rots[i, 2, 2]*z + trns[i, 2])
+            plot_pts[i, 1] = (rots[i, 1, 0]*x + rots[i, 1, 1]*y +
+                              rots[i, 1, 2]*z + trns[i, 1])
+        return plot_pts
+else:
+    _plot_pts = _plot_pts_np
+
+
+def stack_tfrms(tfrms):
+    """ returns the (S, 3, 3) rotations and (S, 3) translations of tfrms """
+    rots = np.array([tfrm[0] for tfrm in tfrms], dtype=float)
+    trns = np.array([tfrm[1] for tfrm in tfrms], dtype=float)
+    return rots, trns
+
+
+def transform_ray(ray, tfrms, stacked_tfrms=None):
+    """ transform the segments of ray to 2D plot coordinates in one step
+
+    Args:
+        ray: sequence of ray segments
+        tfrms: list of global transforms, (rot, trns), for each interface
+        stacked_tfrms: optional result of stack_tfrms(tfrms), used in place
+                       of tfrms when supplied
+
+    Returns:
+        (n, 2) array of (z, y) plot coordinates
+    """
+    n = len(ray)
+    if n == 0:
+        return np.empty((0, 2))
+    pts = np.empty((n, 3))
+    pts[:] = [r.p for r in ray]
+    if stacked_tfrms is None:
+        rots, trns = stack_tfrms(tfrms[:n])
+    else:
+        rots, trns = stacked_tfrms[0][:n], stacked_tfrms[1][:n]
+    return _plot_pts(pts, rots, trns)
+
+
+def transform_ray_bundle(rays, tfrms, stacked_tfrms=None):
+    """ transform a list of rays to 2D plot coordinates in a single step
+
+    The segments of all the rays are stacked and transformed together,
+    rather than one segment at a time.
+
+    Args:
+        rays: list of rays, each a sequence of ray segments
+        tfrms: list of global transforms, (rot, trns), for each interface
+        stacked_tfrms: optional result of stack_tfrms(tfrms), used in place
+                       of tfrms when supplied
+
+    Returns:
+        list of (n, 2) arrays of (z, y) plot coordinates, one per ray
+    """
+    seg_counts = [len(ray) for ray in rays]
+    if sum(seg_counts) == 0:
+        return [np.empty((0, 2)) for ray in rays]
+    pts = np.array([r.p for ray in rays for r in ray], dtype=float)
+    ifc_idx = np.concatenate([np.arange(n) for n in seg_counts])
+    rots, trns = (stack_tfrms(tfrms) if stacked_tfrms is None
+                  else stacked_tfrms)
+    plot_pts = _plot_pts(pts, rots[ifc_idx], trns[ifc_idx])
+    return np.split(plot_pts, np.cumsum(seg_counts)[:-1])
+
+
 def bbox_from_poly(poly):
-    if len(np.array(poly).shape) > 1:
-        minx, miny = np.min(poly, axis=0)
-        maxx, maxy = np.max(poly, axis=0)
-        bbox = np.array([[minx, miny], [maxx, maxy]])
+    # convert once; min and max then reduce the same array in C
+    poly = np.asarray(poly)
+    if poly.size == 0:
+        # no points, return the NaN bbox that marks an empty shape
+        bbox = np.full((2, 2), np.nan)
+    elif poly.ndim > 1:
+        bbox = np.array([poly.min(axis=0), poly.max(axis=0)])
     else:
-        x = poly[0]
-        y = poly[1]
-        bbox = np.array([[x, y], [x, y]])
+        pt = poly[:2]
+        bbox = np.array([pt, pt])
     return bbox
 
 
@@ -51,35 +146,28 @@ def scale_bounds(bbox, oversize_factor):
                      [bbox[1][0]+incr, bbox[1][1]+incr]])
 
 
-def transform_poly(tfrm, poly):
-    coord_flip = np.array([[0., 1.], [1., 0.]])
-
-    poly = np.matmul(coord_flip, poly.T)
-    poly = np.matmul(tfrm[0][1:, 1:], poly).T
+def tfrm_affine(tfrm):
+    """ returns the 2D affine (AT, b) that applies tfrm to plot coordinates
 
-    t = np.array([tfrm[1][1], tfrm[1][2]])
-    poly += t
+    The coordinate flips between the (y, z) plane of tfrm and the (z, y)
+    plot coordinates are folded into AT and b, so that transforming a poly
+    is ``poly @ AT + b``. AT is stored transposed for that product.
+    """
+    A = np.matmul(np.matmul(_COORD_FLIP, tfrm[0][1:, 1:]), _COORD_FLIP)
+    b = np.matmul(_COORD_FLIP, tfrm[1][1:3])
+    return np.ascontiguousarray(A.T), b
 
-    # flip coordinates back to 2D plot coordinates, +y points up
-    poly = np.matmul(poly, coord_flip)
-    return poly
-
-
-def inv_transform_poly(tfrm, poly):
-    coord_flip = np.array([[0., 1.], [1., 0.]])
-    try:
-        poly = np.matmul(coord_flip, poly.T)
-    except TypeError:
-        print(poly)
 
-    t = np.array([tfrm[1][1], tfrm[1][2]])
-    poly -= t
+def transform_poly(tfrm, poly, affine=None):
+    """ transform poly by tfrm, or by a precomputed **affine** of tfrm """
+    AT, b = tfrm_affine(tfrm) if affine is None else affine
+    return np.matmul(poly, AT) + b
 
-    poly = np.matmul(tfrm[0][1:, 1:], poly).T
 
-    # flip coordinates back to 2D plot coordinates, +y points up
-    poly = np.matmul(poly, coord_flip)
-    return poly
+def inv_transform_poly(tfrm, poly, affine=None):
+    """ inverse transform poly by tfrm, or by a precomputed **affine** """
+    AT, b = tfrm_affine(tfrm) if affine is None else affine
+    return np.matmul(poly - b, AT)
 
 
 def fit_data_range(x_data, margin=0.05, range_trunc=0.25, **kwargs):
@@ -9,6 +9,7 @@
 """
 
 import logging
+import time
 from collections import namedtuple
 
 import numpy as np
@@ -78,6 +79,8 @@ class InteractiveFigure(StyledFigure):
         aspect: 'equal' for 1:1 aspect ratio, 'auto' for best ratio
         artist_filter: an (optional) callable applied in
                        find_artists_at_location(), returns True if rejected
+        hover_interval: minimum time, in seconds, between hover updates
+                        while the mouse isn't dragging a shape
     """
 
     def __init__(self,
@@ -98,9 +101,17 @@ class InteractiveFigure(StyledFigure):
         self.do_scale_bounds = do_scale_bounds
 
         self.artist_filter = None
+        self.pickable_artists = []
+        self.pick_radius = 0.
         self.do_action = self.do_shape_action
         self.event_dict = {}
 
+        self.hover_interval = 0.016
+        self.last_hover_time = 0.
+        # latest throttled hover event, and the (canvas, timer) flushing it
+        self.pending_hover_event = None
+        self.hover_timer = None
+
         self.is_mouse_down = False
         # self.mouse_down_count = 0
         self.on_finished = None
@@ -206,14 +217,14 @@ class InteractiveFigure(StyledFigure):
                 if ~np.isnan(bbox).all():
                     # this is the tie between artist and shape
                     artist.shape = (shape, handle)
+                    artist.shape_bbox = bbox
                     # print(f'shape: {type(shape).__name__} {key}: '
                     #       f'{type(poly).__name__}')
                     self.artists.append(artist)
-                    if len(bbox_list) == 0:
-                        bbox_list = bbox
-                    else:
-                        bbox_list = np.vstack((bbox_list, bbox))
-        bbox = util.bbox_from_poly(bbox_list)
+                    bbox_list.append(bbox)
+        bbox_arr = (np.vstack(bbox_list) if len(bbox_list) > 0
+                    else np.empty((0, 2)))
+        bbox = util.bbox_from_poly(bbox_arr)
         return bbox
 
     def create_patches(self, handles):
@@ -455,6 +466,7 @@ class InteractiveFigure(StyledFigure):
         except AttributeError:
             self.ax = self.add_subplot(1, 1, 1, aspect=self.aspect)
 
+        pickable_artists = []
         for a in self.artists:
             if isinstance(a, lines.Line2D):
                 a.set_pickradius(5)
@@ -463,6 +475,15 @@ class InteractiveFigure(StyledFigure):
                 self.ax.add_patch(a)
             else:
                 self.ax.add_artist(a)
+            if hasattr(a, 'shape'):
+                pickable_artists.append((pick_bbox(a), a))
+
+        # sorted once here, so picks come out in zorder without a per-event
+        #  sort; the sort is stable, keeping the draw order for ties
+        self.pickable_artists = sorted(
+            pickable_artists, key=lambda ba: ba[1].get_zorder(), reverse=True)
+        self.pick_radius = max((pick_radius(a) for _, a in pickable_artists),
+                               default=0.)
 
         if self.do_scale_bounds:
             self.view_bbox = util.scale_bounds(self.sys_bbox,
@@ -484,7 +505,23 @@ class InteractiveFigure(StyledFigure):
     def find_artists_at_location(self, event) -> list[SelectInfo]:
         """Returns a list of shapes in zorder at the event location."""
         artists = []
-        for artist in self.ax.get_children():
+        if event.xdata is None or event.ydata is None:
+            return artists
+
+        # pad the event location by the pick tolerance, in data coordinates
+        pick_tol = self.pick_radius*self.dpi/72 + pick_margin
+        inv_tfrm = self.ax.transData.inverted()
+        (x0, y0), (x1, y1) = inv_tfrm.transform(
+            [(event.x - pick_tol, event.y - pick_tol),
+             (event.x + pick_tol, event.y + pick_tol)])
+        xmin, xmax = min(x0, x1), max(x0, x1)
+        ymin, ymax = min(y0, y1), max(y0, y1)
+
+        for bbox, artist in self.pickable_artists:
+            if bbox is not None:
+                if (bbox[0][0] > xmax or bbox[1][0] < xmin or
+                    bbox[0][1] > ymax or bbox[1][1] < ymin):
+                    continue
             if hasattr(artist, 'shape'):
                 inside, info = artist.contains(event)
                 if inside:
@@ -504,8 +541,7 @@ class InteractiveFigure(StyledFigure):
                                      .format(len(artists), shape.get_label(),
                                              handle, artist.get_zorder()))
 
-        return sorted(artists, key=lambda a: a.artist.get_zorder(),
-                      reverse=True)
+        return artists
 
     def do_shape_action(self, event, target:SelectInfo, event_key):
         """Execute the target shape's action for the event_key.
@@ -541,8 +577,7 @@ class InteractiveFigure(StyledFigure):
         # if self.mouse_down_count == 1:
         #     pass
         if self.selected_shape is None:
-            artist_infos = self.find_artists_and_hilite(event)
-            self.artist_infos = artist_infos
+            self.hover(event)
             # display_artist_and_event(f"on_motion ({len(artist_infos)})", 
             #                          event, artist_infos)
         else:
@@ -554,8 +589,44 @@ class InteractiveFigure(StyledFigure):
                 if selection is not None:
                     self.do_action(event, selection, 'drag')
             else:
-                artist_infos = self.find_artists_and_hilite(event)
-                self.artist_infos = artist_infos
+                self.hover(event)
+
+    def hover(self, event):
+        """ update artist_infos and hiliting, throttled by hover_interval
+
+        An event arriving within hover_interval of the last update is kept
+        and applied by a one-shot timer, so the final position is never
+        lost when the mouse stops.
+        """
+        now = time.monotonic()
+        wait = self.hover_interval - (now - self.last_hover_time)
+        if wait > 0:
+            if self.pending_hover_event is None:
+                timer = self.get_hover_timer()
+                timer.interval = max(1, int(1000*wait + 0.5))
+                timer.start()
+            self.pending_hover_event = event
+            return
+        self.pending_hover_event = None
+        self.last_hover_time = now
+        self.artist_infos = self.find_artists_and_hilite(event)
+
+    def get_hover_timer(self):
+        """ returns the one-shot hover timer of the current canvas """
+        # the canvas is replaced when the figure is embedded in a gui
+        if self.hover_timer is None or self.hover_timer[0] is not self.canvas:
+            timer = self.canvas.new_timer()
+            timer.single_shot = True
+            timer.add_callback(self.flush_hover)
+            self.hover_timer = self.canvas, timer
+        return self.hover_timer[1]
+
+    def flush_hover(self):
+        """ apply the hover event held back by the throttle, if any """
+        event, self.pending_hover_event = self.pending_hover_event, None
+        if event is not None and not self.is_mouse_down:
+            self.last_hover_time = 0.
+            self.hover(event)
 
     def on_press(self, event):
         self.save_do_scale_bounds = self.do_scale_bounds
@@ -615,26 +686,63 @@ class InteractiveFigure(StyledFigure):
     def find_artists_and_hilite(self, event) -> list[SelectInfo]:
         """ identify and hilite artists at the mouse event location"""
         artist_infos = self.find_artists_at_location(event)
+        hilited_artist_set = {a.artist for a in self.hilited_artists}
         self.hilited_artists = update_artist_hiliting(
-            self.hilited_artists, artist_infos)
+            self.hilited_artists, artist_infos, redraw=False)
+        # one redraw per change of the hilited set, not one per artist
+        if hilited_artist_set != {a.artist for a in artist_infos}:
+            self.canvas.draw_idle()
         return artist_infos
 
 
-def update_artist_hiliting(hilited_artists, new_artists):
-    """ manage artist hiliting in response to mouse event"""
+# pixels added to the pick radius when prefiltering artists by bbox
+pick_margin = 2
+
+
+def pick_radius(artist):
+    """ returns an upper bound, in points, of the pick radius of artist
+
+    Line2D.contains scales its pickradius from points to pixels; patches
+    use their linewidth as a pixel radius, which is no more than the same
+    value in points at 72 dpi and above.
+    """
+    if isinstance(artist, lines.Line2D):
+        return artist.get_pickradius()
+    elif isinstance(artist, patches.Patch):
+        return artist.get_linewidth()
+    return 0.
+
+
+def pick_bbox(artist):
+    """ returns the data bbox for prefiltering picks, or None to skip it """
+    bbox = getattr(artist, 'shape_bbox', None)
+    if (bbox is None or isinstance(artist, collections.Collection) or
+            np.isnan(bbox).any()):
+        # collections may span more than the bbox of their handle
+        return None
+    return bbox
+
+
+def update_artist_hiliting(hilited_artists, new_artists, redraw=True):
+    """ manage artist hiliting in response to mouse event
+
+    If redraw is False, the caller is responsible for redrawing the canvas.
+    """
     hilited_artist_set = {a.artist for a in hilited_artists}
     new_artists_set = {a.artist for a in new_artists}
     to_unhilite = list(hilited_artist_set - new_artists_set)
     for a in to_unhilite:
         try:
             a.unhighlight(a)
-            a.figure.canvas.draw()
+            if redraw:
+                a.figure.canvas.draw()
         except Exception as e:
             pass
     to_hilite = list(new_artists_set - hilited_artist_set)
     for a in to_hilite:
         a.highlight(a)
-        a.figure.canvas.draw()
+        if redraw:
+            a.figure.canvas.draw()
     return new_artists
 
 
@@ -12,7 +12,7 @@ import numpy as np
 
 import rayoptics
 from rayoptics.mpl.interactivefigure import InteractiveFigure
-from rayoptics.gui.util import bbox_from_poly, scale_bounds
+from rayoptics.gui.util import bbox_from_poly, scale_bounds, stack_tfrms
 
 
 class InteractiveLayout(InteractiveFigure):
@@ -81,9 +81,13 @@ class InteractiveLayout(InteractiveFigure):
         super().sync_light_or_dark(is_dark, **kwargs)
 
     def update_data(self, **kwargs):
+        rayoptics.elem.layout.clear_affine_cache()
         self.artists = []
         concat_bbox = []
         layout = self.layout
+        # stack the global transforms once for all of the ray shapes
+        self.stacked_tfrms = stack_tfrms(
+            layout.opt_model['seq_model'].gbl_tfrms)
         build = kwargs.get('build', 'rebuild')
 
         if self.do_draw_parts:
@@ -91,6 +95,7 @@ class InteractiveLayout(InteractiveFigure):
                 self.ele_shapes = []
             e_nodes = layout.renderable_pt_nodes(part_filter=self.part_filter)
             e_node_set = {e.id for e in e_nodes}
+            layout.drop_stale_oes(e_node_set)
             ele_shapes_set = {ele.e for ele in self.ele_shapes}
             to_remove = list(ele_shapes_set - e_node_set)
             self.ele_shapes = [ele for ele in self.ele_shapes 
@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 # Copyright © 2018 Michael J. Hayford
-""" Table model supporting data content via python eval() fct
+""" Table model supporting data content via python access strings
 
 .. Created on Wed Mar 14 21:59:43 2018
 
 .. codeauthor: Michael J. Hayford
 """
+import ast
 import logging
 
 from PySide6 import QtCore
@@ -17,20 +18,90 @@ from rayoptics.util.misc_math import isanumber
 logger = logging.getLogger(__name__)
 
 
+# placeholder in access paths for the table row
+ROW = object()
+
+
+def parse_eval_path(eval_str):
+    """ Parse an eval string into a list of access steps.
+
+    **eval_str** is appended to a root name and parsed once; a replacement
+    field, i.e. {}, stands for the table row. The supported operations are
+    attribute access, other than dunder names, indexing and calls with
+    literal or row arguments.
+
+    Returns:
+        a list of (op, arg) tuples, op being 'attr', 'item' or 'call'
+
+    Raises:
+        ValueError: if **eval_str** uses any other expression
+    """
+    tree = ast.parse(('root' + eval_str).format('r'), mode='eval')
+
+    def arg_value(node):
+        if isinstance(node, ast.Name) and node.id == 'r':
+            return ROW
+        return ast.literal_eval(node)
+
+    def steps(node):
+        if isinstance(node, ast.Name) and node.id == 'root':
+            return []
+        elif (isinstance(node, ast.Attribute) and
+              not node.attr.startswith('__')):
+            return steps(node.value) + [('attr', node.attr)]
+        elif isinstance(node, ast.Subscript):
+            return steps(node.value) + [('item', arg_value(node.slice))]
+        elif isinstance(node, ast.Call) and not node.keywords:
+            args = tuple(arg_value(a) for a in node.args)
+            return steps(node.func) + [('call', args)]
+        raise ValueError(f'unsupported eval string: "{eval_str}"')
+
+    return steps(tree.body)
+
+
+def _step(obj, op, arg, r):
+    if op == 'attr':
+        return getattr(obj, arg)
+    elif op == 'item':
+        return obj[r if arg is ROW else arg]
+    else:
+        return obj(*(r if a is ROW else a for a in arg))
+
+
+def get_path_value(obj, path, r=None):
+    """ Walk the access **path** from **obj**, using **r** for the row. """
+    for op, arg in path:
+        obj = _step(obj, op, arg, r)
+    return obj
+
+
+def set_path_value(obj, path, r, value):
+    """ Assign **value** to the target of the access **path** from **obj**.
+
+    The last step of **path** must be an attribute or an item.
+    """
+    obj = get_path_value(obj, path[:-1], r)
+    op, arg = path[-1]
+    if op == 'attr':
+        setattr(obj, arg, value)
+    else:
+        obj[r if arg is ROW else arg] = value
+
+
 class PyTableModel(QtCore.QAbstractTableModel):
-    """Table model supporting data content via python eval() fct.
+    """Table model supporting data content via python access strings.
 
     Model interface for table view of list structures.
 
     Attributes:
-        root: object or list at the root of the eval() string
+        root: object or list at the root of the access strings
         rootEvalStr: string that is concatentated to the root name and
-                    passed to the eval() function. This will accomodate
+                    parsed into an access path. This will accomodate
                     dynamic name changes.
         colEvalStr: string that is concatentated to the root name and
-                    passed to the eval() function. There should be a
+                    parsed into an access path. There should be a
                     replacement field, i.e. {} where the row value will
-                    be substituted using the str.format() function.
+                    be substituted.
         rowHeaders: list of strings, length defines number of rows in the
                     table
         colHeaders: list of strings, length defines number of columns in
@@ -51,12 +122,17 @@ class PyTableModel(QtCore.QAbstractTableModel):
         """
     """
         super().__init__()
+        # the root setter also initializes the root object cache
         self.root = root
         self.rootEvalStr = rootEvalStr
+        self._root_path = (parse_eval_path(rootEvalStr)
+                           if len(rootEvalStr) > 0 else None)
         self.colEvalStr = colEvalStr
+        self._col_path = [parse_eval_path(ce) for ce in colEvalStr]
         self.rowHeaders = rowHeaders
         self.colHeaders = colHeaders
         self.colFormats = colFormats
+        self._col_formatters = [fmt.format for fmt in colFormats]
         self.is_editable = is_editable
         self.get_num_rows = get_num_rows
         self.get_row_headers = get_row_headers
@@ -64,6 +140,16 @@ class PyTableModel(QtCore.QAbstractTableModel):
             self.drop_actions = drop_actions
         else:
             self.drop_actions = [None]*len(self.colHeaders)
+        self.update.connect(self.invalidate_root)
+
+    @property
+    def root(self):
+        return self._root
+
+    @root.setter
+    def root(self, root):
+        self._root = root
+        self.invalidate_root()
 
     def rowCount(self, index):
         if self.get_num_rows is not None:
@@ -94,14 +180,27 @@ class PyTableModel(QtCore.QAbstractTableModel):
         else:
             return base_flag
 
+    def beginResetModel(self):
+        self.invalidate_root()
+        super().beginResetModel()
+
+    def endResetModel(self):
+        self.invalidate_root()
+        super().endResetModel()
+
+    def invalidate_root(self, *args):
+        """ Discard the cached root object; args allow use as a slot. """
+        self._root_cache = None
+
     def get_root_object(self):
-        if len(self.rootEvalStr) == 0:
+        if self._root_path is None:
             return self.root
+        elif self._root_cache is not None:
+            return self._root_cache
         else:
-            root_eval_str = ('self.root' + self.rootEvalStr)
             try:
-                root = eval(root_eval_str)
-                return root
+                self._root_cache = get_path_value(self.root, self._root_path)
+                return self._root_cache
             except IndexError:
                 return self.root
 
@@ -110,14 +209,15 @@ class PyTableModel(QtCore.QAbstractTableModel):
         if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
             r = index.row()
             c = index.column()
-            eval_str = ('root' + self.colEvalStr[c]).format(r)
+            val = None
             try:
-                val = eval(eval_str)
-                valStr = self.colFormats[c].format(val)
+                val = get_path_value(root, self._col_path[c], r)
+                valStr = self._col_formatters[c](val)
                 return valStr
             except IndexError:
                 return ''
             except TypeError:
+                eval_str = ('root' + self.colEvalStr[c]).format(r)
                 print('Data type error: ', eval_str, val)
                 return ''
         else:
@@ -128,18 +228,20 @@ class PyTableModel(QtCore.QAbstractTableModel):
         if role == Qt.ItemDataRole.EditRole:
             r = index.row()
             c = index.column()
-            exec_str = ('root' + self.colEvalStr[c]).format(r)
-            if not isanumber(value):
-                value = "'" + value + "'"
-            exec_str = exec_str + '=' + value
+            path = self._col_path[c]
+            if path[-1][0] == 'call':
+                logger.info('Not assignable: "%s"', value)
+                return False
+            if isanumber(value):
+                try:
+                    value = ast.literal_eval(value)
+                except (ValueError, SyntaxError):
+                    value = float(value)
             try:
-                exec(exec_str)
+                set_path_value(root, path, r, value)
                 self.update.emit(root, r)
                 return True
             except IndexError:
                 return False
-            except SyntaxError:
-                logger.info('Syntax error: "%s"', value)
-                return False
         else:
             return False
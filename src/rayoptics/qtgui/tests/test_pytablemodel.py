@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Test the access path parsing of the table model eval strings"""
+
+
+import unittest
+import warnings
+from pathlib import Path
+from types import SimpleNamespace
+
+import rayoptics as ro
+from rayoptics.gui.appcmds import open_model
+from rayoptics.qtgui.pytablemodel import (ROW, parse_eval_path,
+                                          get_path_value, set_path_value,
+                                          PyTableModel)
+
+
+class ParseEvalPathTestCase(unittest.TestCase):
+
+    def test_column_strings(self):
+        self.assertEqual(parse_eval_path('.ifcs[{}].interface_type()'),
+                         [('attr', 'ifcs'), ('item', ROW),
+                          ('attr', 'interface_type'), ('call', ())])
+        self.assertEqual(parse_eval_path('.element_type({})'),
+                         [('attr', 'element_type'), ('call', (ROW,))])
+        self.assertEqual(parse_eval_path('.elements[{}].tfrm[1][1]'),
+                         [('attr', 'elements'), ('item', ROW),
+                          ('attr', 'tfrm'), ('item', 1), ('item', 1)])
+        self.assertEqual(parse_eval_path('[0][{}][2]'),
+                         [('item', 0), ('item', ROW), ('item', 2)])
+        self.assertEqual(parse_eval_path(".analysis_results['parax_data']"),
+                         [('attr', 'analysis_results'),
+                          ('item', 'parax_data')])
+
+    def test_rejected_expressions(self):
+        for eval_str in ['.gaps[{}].thi + 1',
+                         '.ifcs[{}].profile_cv if True else 0',
+                         '.__class__.__subclasses__()',
+                         ".f(__import__('os'))",
+                         '.f(x={})']:
+            with self.assertRaises(ValueError):
+                parse_eval_path(eval_str)
+
+
+class PathValueTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = SimpleNamespace(
+            gaps=[SimpleNamespace(thi=1.0), SimpleNamespace(thi=2.0)],
+            tfrms=[[0., [0., 1., 2.]], [0., [3., 4., 5.]]],
+            scale=lambda i: 10*i)
+
+    def test_get(self):
+        self.assertEqual(get_path_value(
+            self.root, parse_eval_path('.gaps[{}].thi'), 1), 2.0)
+        self.assertEqual(get_path_value(
+            self.root, parse_eval_path('.tfrms[{}][1][2]'), 0), 2.)
+        self.assertEqual(get_path_value(
+            self.root, parse_eval_path('.scale({})'), 3), 30)
+
+    def test_set_attr(self):
+        set_path_value(self.root, parse_eval_path('.gaps[{}].thi'), 0, 5.0)
+        self.assertEqual(self.root.gaps[0].thi, 5.0)
+        self.assertEqual(self.root.gaps[1].thi, 2.0)
+
+    def test_set_item(self):
+        set_path_value(self.root, parse_eval_path('.tfrms[{}][1][1]'), 1, 9.)
+        self.assertEqual(self.root.tfrms[1][1], [3., 9., 5.])
+        self.assertEqual(self.root.tfrms[0][1], [0., 1., 2.])
+
+
+class RootCacheTestCase(unittest.TestCase):
+    def test_assign_root(self):
+        """ assigning root, as RayBundle.on_select_ray does, drops the cache """
+        def model(thi):
+            return SimpleNamespace(gaps=[SimpleNamespace(thi=thi)])
+        table = PyTableModel(SimpleNamespace(sm=model(1.0)), '.sm',
+                             ['.gaps[{}].thi'], ['0'], ['thi'], ['{:.1f}'])
+        self.assertEqual(table.get_root_object().gaps[0].thi, 1.0)
+
+        table.root = SimpleNamespace(sm=model(2.0))
+        self.assertEqual(table.get_root_object().gaps[0].thi, 2.0)
+
+
+class TableColumnsTestCase(unittest.TestCase):
+    """ the lens and element table columns match eval() on a real model """
+
+    def test_table_columns(self):
+        warnings.filterwarnings("ignore", category=RuntimeWarning)
+        root_pth = Path(ro.__file__).resolve().parent
+        opm = open_model(root_pth/'optical/tests/cell_phone_camera.roa')
+        sm, em = opm['seq_model'], opm['ele_model']
+        tables = [(sm, sm.get_num_surfaces(),
+                   ['.ifcs[{}].interface_type()', '.ifcs[{}].profile_cv',
+                    '.gaps[{}].thi', '.gaps[{}].medium.name()']),
+                  (em, em.get_num_elements(),
+                   ['.elements[{}].label', '.element_type({})',
+                    '.elements[{}].tfrm[1][1]'])]
+        for root, num_rows, col_strs in tables:
+            for col_str in col_strs:
+                path = parse_eval_path(col_str)
+                for r in range(num_rows):
+                    try:
+                        expected = eval(('root' + col_str).format(r))
+                    except IndexError:
+                        with self.assertRaises(IndexError):
+                            get_path_value(root, path, r)
+                        continue
+                    self.assertEqual(get_path_value(root, path, r), expected)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
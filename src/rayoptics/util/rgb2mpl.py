@@ -6,14 +6,21 @@
 
 .. codeauthor: Michael J. Hayford
 """
+from functools import lru_cache
 
 
 def rgb2mpl(rgb):
     """ convert 8 bit RGB data to 0 to 1 range for mpl """
+    return _rgb2mpl(tuple(rgb))
+
+
+@lru_cache(maxsize=64)
+def _rgb2mpl(rgb):
+    """ cached conversion of an RGB(A) tuple; the result is immutable """
     if len(rgb) == 3:
-        return [rgb[0]/255., rgb[1]/255., rgb[2]/255.]
+        return (rgb[0]/255., rgb[1]/255., rgb[2]/255.)
     elif len(rgb) == 4:
-        return [rgb[0]/255., rgb[1]/255., rgb[2]/255., rgb[3]/255.]
+        return (rgb[0]/255., rgb[1]/255., rgb[2]/255., rgb[3]/255.)
 
 
 backgrnd_color = rgb2mpl([237, 243, 254])  # light blue